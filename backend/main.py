@@ -9,11 +9,14 @@ from dotenv import load_dotenv
 
 try:
     from backend.llm_service import analyze_chat, EvaluationResult
+    from backend.advanced_analysis import shutdown_browser
 except ImportError:
     try:
         from .llm_service import analyze_chat, EvaluationResult
+        from .advanced_analysis import shutdown_browser
     except ImportError:
          from llm_service import analyze_chat, EvaluationResult
+         from advanced_analysis import shutdown_browser
 
 load_dotenv()
 
@@ -45,6 +48,11 @@ class ChatInput(BaseModel):
     messages: List[Message]
     model_provider: Optional[str] = "openai"
 
+@app.on_event("shutdown")
+async def close_shared_browser():
+    # The analyzer keeps one Chromium alive across requests; release it with the app.
+    await shutdown_browser()
+
 @app.get("/")
 def read_root():
     return {"message": "HTML LLM Judge API is running"}
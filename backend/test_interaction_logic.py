@@ -1,6 +1,10 @@
+import hashlib
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, AsyncMock
-from advanced_analysis import AdvancedAnalyzer
+from unittest.mock import MagicMock, AsyncMock, patch
+import advanced_analysis
+from advanced_analysis import AdvancedAnalyzer, APP_URL, APP_HOST_PATTERN, _document_server
 
 class TestInteractionImprovements(unittest.IsolatedAsyncioTestCase):
     async def test_input_type_detection_and_content(self):
@@ -22,5 +26,124 @@ class TestInteractionImprovements(unittest.IsolatedAsyncioTestCase):
         analyzer = AdvancedAnalyzer("<html></html>")
         self.assertTrue(hasattr(analyzer, "_analyze_mobile_view"))
 
+    def test_score_candidate_prefers_submit_over_close(self):
+        analyzer = AdvancedAnalyzer("<html></html>")
+        base = {"tag": "button", "id": "", "cls": "", "type": "", "aria": "", "role": "",
+                "rating": None, "checked": None, "dismiss": None}
+        submit_score, _ = analyzer._score_candidate({**base, "text": "Submit"})
+        close_score, _ = analyzer._score_candidate({**base, "text": "Close"})
+        self.assertGreater(submit_score, close_score)
+        self.assertLess(close_score, 0)
+        rating_score, _ = analyzer._score_candidate({**base, "text": "⭐⭐⭐"})
+        self.assertEqual(rating_score, 12)
+        # Substring match: 'Get started' still counts as a positive action.
+        start_score, _ = analyzer._score_candidate({**base, "text": "Get started"})
+        self.assertEqual(start_score, 7)
+
+    def test_plan_round_groups_and_defers(self):
+        analyzer = AdvancedAnalyzer("<html></html>")
+        base = {"tag": "button", "id": "", "cls": "btn btn-primary", "type": "", "aria": "", "role": "",
+                "rating": None, "checked": None, "dismiss": None}
+
+        def cand(**info):
+            info = {**base, **info}
+            score, shape = analyzer._score_candidate(info)
+            return {"score": score, "shape": shape, "tag": info["tag"], "text": info["text"]}
+
+        start, nxt = cand(text="Start"), cand(text="Next")
+        radios = [cand(tag="input", type="radio", cls="opt", text=str(i)) for i in range(3)]
+        with_id = cand(text="Submit", id="submit")
+        planned, deferred = analyzer._plan_round([start, nxt, with_id] + radios)
+
+        # Radios and id'd elements are never grouped; same-shape buttons are held back.
+        self.assertEqual(planned, [start, with_id] + radios)
+        self.assertEqual(deferred, [nxt])
+        self.assertEqual(list(analyzer._deferred_attempts(deferred)), [nxt])
+
+        # Candidates over the per-tag cap are held back too, not dropped.
+        buttons = [cand(text=f"Option {i}", id=f"b{i}") for i in range(8)]
+        planned, deferred = analyzer._plan_round(buttons)
+        self.assertEqual(planned, buttons[:5])
+        self.assertEqual(deferred, buttons[5:])
+
+    async def test_axe_violations_reported_in_order(self):
+        analyzer = AdvancedAnalyzer("<html></html>")
+        page = AsyncMock()
+        page.evaluate.return_value = {"violations": [
+            {"impact": "serious", "help": "Images need alt text",
+             "nodes": [{"html": "<img src='a.png'>", "target": "img"}]},
+            {"impact": "minor", "help": "Headings should nest", "nodes": []},
+        ]}
+        analyzer._open_page = AsyncMock(return_value=page)
+        with patch("advanced_analysis._get_axe_source", AsyncMock(return_value="/* axe */")):
+            await analyzer._run_axe_phase(MagicMock(), "http://example.test/")
+
+        self.assertEqual(analyzer.logs["critical"], ["[SERIOUS] Images need alt text (1 occurrences)"])
+        self.assertEqual(analyzer.logs["warnings"], [
+            "[MINOR] Headings should nest (0 occurrences)",
+            "[AXE] Images need alt text",
+            "  - Failed on: <img src='a.png'> (img)",
+            "[AXE] Headings should nest",
+        ])
+        self.assertEqual(analyzer.logs["score_cap"], 70)
+
+    async def test_failing_phase_keeps_sibling_traces(self):
+        analyzer = AdvancedAnalyzer("<button>Go</button>")
+
+        async def axe_phase(context, url):
+            analyzer._log_trace("wheelchair", "axe ran")
+
+        async def inventory_phase(context, url, results):
+            analyzer._log_trace("clipboard", "inventory ran")
+            results["fidelity"] = "inventory"
+
+        async def mobile_phase(context, url, results):
+            analyzer._log_trace("iphone", "mobile started")
+            raise RuntimeError("screenshot failed")
+
+        analyzer._run_axe_phase = axe_phase
+        analyzer._run_inventory_phases = inventory_phase
+        analyzer._run_mobile_phases = mobile_phase
+        browser = MagicMock()
+        browser.new_context = AsyncMock(return_value=AsyncMock())
+        with patch("advanced_analysis.get_browser", AsyncMock(return_value=browser)):
+            results = await analyzer.analyze()
+
+        trace = results["trace"]
+        for line in ("axe ran", "inventory ran", "mobile started"):
+            self.assertTrue(any(line in t for t in trace), line)
+        self.assertEqual(results["mobile"], "System Error: screenshot failed")
+
+    async def test_app_host_serves_only_the_document(self):
+        for url in (APP_URL, "http://analyzed-page.localhost/x.png", "http://analyzed-page.localhost:8080/api/data"):
+            self.assertTrue(APP_HOST_PATTERN.search(url), url)
+        self.assertFalse(APP_HOST_PATTERN.search("https://cdn.example.com/analyzed-page.localhost/x.js"))
+
+        serve = _document_server("<p>Hi ⭐</p>")
+        route = AsyncMock()
+        route.request.url = APP_URL + "?step=2"
+        await serve(route)
+        route.fulfill.assert_awaited_once_with(status=200, content_type="text/html; charset=utf-8", body="<p>Hi ⭐</p>".encode("utf-8"))
+
+        route = AsyncMock()
+        route.request.url = "http://analyzed-page.localhost/api/data"
+        await serve(route)
+        self.assertEqual(route.fulfill.await_args.kwargs["status"], 404)
+
+    def test_axe_cache_is_verified_against_the_pinned_hash(self):
+        source = b"window.axe = {};"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "axe.min.js")
+            with patch.object(advanced_analysis, "AXE_CACHE_PATH", path), \
+                 patch.object(advanced_analysis, "AXE_SCRIPT_SHA256", hashlib.sha256(source).hexdigest()):
+                advanced_analysis._write_axe_cache(source)
+                self.assertEqual(advanced_analysis._read_axe_cache(), source.decode())
+                with open(path, "wb") as f:
+                    f.write(b"<html>captive portal</html>")
+                self.assertIsNone(advanced_analysis._read_axe_cache())
+            with patch.object(advanced_analysis, "AXE_CACHE_PATH", path), \
+                 patch.object(advanced_analysis, "AXE_SCRIPT_SHA256", ""):
+                self.assertIsNone(advanced_analysis._read_axe_cache())
+
 if __name__ == '__main__':
     unittest.main()
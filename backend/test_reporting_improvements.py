@@ -1,5 +1,5 @@
 import unittest
-from advanced_analysis import AdvancedAnalyzer
+from advanced_analysis import AdvancedAnalyzer, _font_category
 from bs4 import BeautifulSoup
 
 class TestReportingImprovements(unittest.TestCase):
@@ -39,5 +39,40 @@ class TestReportingImprovements(unittest.TestCase):
         warnings = analyzer.logs["warnings"]
         self.assertEqual(len(warnings), 6, "Should report ALL 6 broken links (limit removed)")
 
+    def test_repeated_links_reported_once(self):
+        # Shared nav + footer: the same broken anchor appears three times
+        html = '<a href="#pricing">Pricing</a>' * 3 + '<a href="#top">Top</a><div id="top"></div>'
+        analyzer = AdvancedAnalyzer(html)
+        analyzer._check_links()
+
+        self.assertEqual(analyzer.logs["warnings"], ["Broken Internal Link: href='#pricing' points to non-existent ID."])
+        self.assertEqual(analyzer.logs["stats"]["links"], 4)
+        self.assertEqual(analyzer.logs["stats"]["unique_links"], 2)
+
+    def test_repeated_js_errors_reported_once(self):
+        analyzer = AdvancedAnalyzer("<button>Go</button>")
+        for _ in range(5):
+            analyzer._handle_js_error("ReferenceError: initSlider is not defined")
+            analyzer._handle_js_error("TypeError: moengage.trackClick is not a function")
+
+        self.assertEqual(analyzer.logs["critical"], ["JS Error: ReferenceError: initSlider is not defined"])
+        self.assertEqual(analyzer.logs["warnings"], ["SDK Warning: TypeError: moengage.trackClick is not a function"])
+
+    def test_font_category_uses_primary_family(self):
+        self.assertEqual(_font_category('"Times New Roman", serif'), "serif")
+        self.assertEqual(_font_category("Georgia, serif"), "serif")
+        self.assertEqual(_font_category("Arial, sans-serif"), "sans")
+        self.assertEqual(_font_category("Inter, Times, sans-serif"), "sans")
+
+    def test_doctype_check_with_many_leading_comments(self):
+        # Many comments and no doctype used to backtrack exponentially in _DOCTYPE_RE.
+        analyzer = AdvancedAnalyzer('<!---->' * 40 + '<html><body></body></html>')
+        analyzer._run_html5_validation()
+        self.assertIn("HTML5 Validation: Missing <!DOCTYPE html> declaration.", analyzer.logs["warnings"])
+
+        analyzer = AdvancedAnalyzer('<!-- a --> <!-- b --><!DOCTYPE html><html></html>')
+        analyzer._run_html5_validation()
+        self.assertEqual(analyzer.logs["warnings"], [])
+
 if __name__ == '__main__':
     unittest.main()
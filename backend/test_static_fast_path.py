@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from advanced_analysis import AdvancedAnalyzer
+
+class TestStaticFastPath(unittest.IsolatedAsyncioTestCase):
+    async def test_static_page_skips_only_the_interaction_loop(self):
+        html = '<html><body><h1>Sale</h1><p>50% off today</p><img src="banner.png"></body></html>'
+        analyzer = AdvancedAnalyzer(html)
+        self.assertTrue(analyzer._trivial)
+
+        page = MagicMock()
+        page.goto = AsyncMock()
+        page.add_init_script = AsyncMock()
+        page.set_viewport_size = AsyncMock()
+        page.evaluate = AsyncMock(return_value=False)
+        page.screenshot = AsyncMock(return_value=b"png")
+        page.locator = MagicMock()
+        analyzer._open_page = AsyncMock(return_value=page)
+        results = {}
+        await analyzer._run_mobile_phases(MagicMock(), "http://test/", results)
+
+        page.locator.return_value.evaluate_all.assert_not_called()
+        self.assertTrue(any("fast-path" in t for t in analyzer.logs["execution_trace"]))
+        self.assertIn("interaction simulation skipped", results["mobile"])
+        self.assertIn("LANDSCAPE PASS", results["mobile"])
+        self.assertIn("screenshot_portrait", results)
+        self.assertIn("screenshot_landscape", results)
+
+    async def test_static_page_without_playwright_uses_parsed_inventory(self):
+        html = '<html><body><h1>Sale</h1><p>50% off today</p><img src="banner.png"></body></html>'
+        analyzer = AdvancedAnalyzer(html)
+        with patch("advanced_analysis.PLAYWRIGHT_AVAILABLE", False), \
+             patch("advanced_analysis.get_browser", AsyncMock()) as get_browser:
+            results = await analyzer.analyze()
+
+        get_browser.assert_not_called()
+        self.assertIn("missing 'alt'", results["access"])
+        self.assertIn("Found 0 Buttons, 0 Inputs, 1 Images.", results["fidelity"])
+        self.assertIn("Sale 50% off today", results["fidelity"])
+        self.assertIn("UNAVAILABLE", results["visual"])
+
+    def test_interactive_pages_are_not_trivial(self):
+        self.assertFalse(AdvancedAnalyzer('<button>Go</button>')._trivial)
+        self.assertFalse(AdvancedAnalyzer('<p>Hi</p><script>init()</script>')._trivial)
+        self.assertFalse(AdvancedAnalyzer('<div onclick="next()">Next</div>')._trivial)
+        self.assertFalse(AdvancedAnalyzer('<body onload="init()"><p>Hi</p></body>')._trivial)
+        self.assertFalse(AdvancedAnalyzer('<img src="x.png" alt="" onerror="track()">')._trivial)
+        self.assertFalse(AdvancedAnalyzer('<div ontouchstart="swipe()">Swipe</div>')._trivial)
+
+    def test_markup_after_body_is_analysed(self):
+        # lxml puts elements that follow </body> outside the <body> element.
+        html = '<html><body><h1>Offer</h1></body><button onclick="claim()">Claim</button><img src="x.png"></html>'
+        analyzer = AdvancedAnalyzer(html)
+        self.assertFalse(analyzer._trivial)
+        analyzer._run_bs4_checks()
+        self.assertEqual(analyzer.logs["stats"]["interactive_elements"], 1)
+        self.assertTrue(any("missing 'alt'" in c for c in analyzer.logs["critical"]))
+        self.assertFalse(AdvancedAnalyzer('<html><head><script>init()</script></head><body><p>Hi</p></body></html>')._trivial)
+
+if __name__ == '__main__':
+    unittest.main()